@@ -7,6 +7,7 @@ Aaron Beckley December 17, 2025
 
 """
 
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 from typing import Optional
@@ -14,16 +15,34 @@ from chess import Board, Move, Piece, SQUARES, square_name, PIECE_NAMES
 from descriptive_notation_parser import DescriptiveNotationParser
 
 
+# File names in descriptive notation, indexed by file (a-h)
+_FILE_NAMES = ('QR', 'QN', 'QB', 'Q', 'K', 'KB', 'KN', 'KR')
+
+
 class MoveToDescriptive:
     """Convert chess moves to descriptive notation."""
     
-    # File names in descriptive notation
-    FILE_NAMES = {
-        0: 'QR', 1: 'QN', 2: 'QB', 3: 'Q',
-        4: 'K', 5: 'KB', 6: 'KN', 7: 'KR'
-    }
+    FILE_NAMES = _FILE_NAMES
+    
+    # Piece letters indexed by python-chess piece type (1 = pawn ... 6 = king)
+    PIECE_LETTERS = ('', 'P', 'N', 'B', 'R', 'Q', 'K')
     
-    PIECE_LETTERS = {1: 'P', 2: 'N', 3: 'B', 4: 'R', 5: 'Q', 6: 'K'}
+    # Destination square names indexed by [square][color]; ranks are counted
+    # from the moving player's side, so e4 is ('K5', 'K4')
+    DEST_NAMES = tuple(
+        (f"{_FILE_NAMES[sq % 8]}{8 - sq // 8}", f"{_FILE_NAMES[sq % 8]}{sq // 8 + 1}")
+        for sq in range(64)
+    )
+    
+    # Text written before the destination, so each move string is one concatenation:
+    # "N-" for moves and "Nx" for captures (by piece type), "QBPx" for pawn
+    # captures (by the file the pawn came from)
+    MOVE_PREFIXES = tuple(f"{letter}-" for letter in PIECE_LETTERS)
+    CAPTURE_PREFIXES = tuple(f"{letter}x" for letter in PIECE_LETTERS)
+    PAWN_CAPTURE_PREFIXES = tuple(f"{name}Px" for name in _FILE_NAMES)
+    
+    # Promotion suffixes indexed by the promoted piece type, e.g. "(Q)"
+    PROMOTION_SUFFIXES = tuple(f"({letter})" if letter else '' for letter in PIECE_LETTERS)
     
     @classmethod
     def convert(cls, board: Board, move: Move) -> str:
@@ -43,43 +62,79 @@ class MoveToDescriptive:
         if piece is None:
             return move.uci()
         
-        # Get piece letter
-        piece_letter = cls.PIECE_LETTERS.get(piece.piece_type, '')
-        
-        # Get destination in descriptive notation
-        to_file = to_sq % 8
-        to_rank = to_sq // 8
-        
-        # Rank is from the player's perspective
-        if piece.color:  # White
-            rank_num = to_rank + 1
-        else:  # Black
-            rank_num = 8 - to_rank
-        
-        file_name = cls.FILE_NAMES[to_file]
-        
-        # Build the move string
+        # Pick the prefix for the kind of move
         if captured:
-            # Capture
             if piece.piece_type == 1:  # Pawn
                 # For pawn captures, show the file
-                from_file = from_sq % 8
-                from_file_name = cls.FILE_NAMES[from_file]
-                result = f"{from_file_name}Px{file_name}{rank_num}"
+                prefix = cls.PAWN_CAPTURE_PREFIXES[from_sq % 8]
             else:
-                result = f"{piece_letter}x{file_name}{rank_num}"
+                prefix = cls.CAPTURE_PREFIXES[piece.piece_type]
         else:
-            # Regular move
-            result = f"{piece_letter}-{file_name}{rank_num}"
+            prefix = cls.MOVE_PREFIXES[piece.piece_type]
+        
+        # Destination in descriptive notation, from the player's perspective
+        result = prefix + cls.DEST_NAMES[to_sq][piece.color]
         
         # Handle promotion
         if move.promotion:
-            promo_letter = cls.PIECE_LETTERS.get(move.promotion, '')
-            result += f"({promo_letter})"
+            result += cls.PROMOTION_SUFFIXES[move.promotion]
         
         return result
 
 
+class MoveHistory:
+    """
+    Recorded moves of a game, kept apart from the board's own move stack
+    (python-chess clears that on every setup edit).
+    
+    The moves are split into segments, each played on from a stored FEN. An
+    edit starts a new segment at the edited position, so the moves recorded
+    before and after it are kept.
+    """
+    
+    def __init__(self, fen):
+        self.moves = []  # Every recorded move, in order
+        self.notations = []  # Descriptive notation of each move
+        self._segment_fens = {0: fen}  # Position index -> FEN each segment starts from
+    
+    def __len__(self):
+        return len(self.moves)
+    
+    def segment(self, index):
+        """Return (start index, FEN) of the segment holding position index."""
+        start = max(start for start in self._segment_fens if start <= index)
+        return start, self._segment_fens[start]
+    
+    def position(self, index):
+        """Return a new board with the position after the first index moves."""
+        start, fen = self.segment(index)
+        board = Board(fen)
+        for move in self.moves[start:index]:
+            board.push(move)
+        return board
+    
+    def append(self, move, notation):
+        """Record a move played from the last position."""
+        self.moves.append(move)
+        self.notations.append(notation)
+    
+    def truncate(self, length):
+        """Drop every move after the first length moves."""
+        del self.moves[length:]
+        del self.notations[length:]
+        for start in [start for start in self._segment_fens if start > length]:
+            del self._segment_fens[start]
+    
+    def set_position(self, index, fen):
+        """Replace the position at index with an edited one, keeping every move."""
+        after = index + 1
+        if after <= len(self.moves) and after not in self._segment_fens:
+            # The next move was played from the old position, so the moves
+            # after it go on from where it led
+            self._segment_fens[after] = self.position(after).fen()
+        self._segment_fens[index] = fen
+
+
 class ChessBoardGUI:
     """Main GUI application for chess board with descriptive notation."""
     
@@ -99,28 +154,43 @@ class ChessBoardGUI:
     
     PIECE_TYPES = ['K', 'Q', 'R', 'B', 'N', 'P']
     
+    # Offset of the contrasting shadow drawn behind each piece glyph
+    SHADOW_OFFSET = (1, 1)
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Chess Board - Descriptive Notation")
         self.root.configure(bg='#2b2b2b')
         
         # Board state
+        # The board's own move stack holds the moves from the start of the
+        # history segment being viewed up to the current move
         self.board = Board()
-        self.move_history = []  # List of FENs before each move
-        self.move_notations = []  # Descriptive notation strings
-        self.board_states = [Board().fen()]  # All board states including initial
+        self._history = MoveHistory(self.board.fen())
         self.current_move_index = 0  # Which move we're viewing (0 = start position)
+        self._parser = DescriptiveNotationParser(self.board)  # Board is only ever changed in place
         
         # Animation state
         self.animation_duration = 200  # milliseconds
-        self.animation_steps = 15
+        self.animation_frame_delay = 16  # milliseconds between frames, about 60 FPS
         self.animating = False
         
-        # Drag state
+        # Canvas center coordinates of each square (white at the bottom)
+        half = self.SQUARE_SIZE // 2
+        self._square_centers = tuple(
+            ((sq % 8) * self.SQUARE_SIZE + half, (7 - sq // 8) * self.SQUARE_SIZE + half)
+            for sq in SQUARES
+        )
+        
+        # Drag state; "item" holds the ghost's (shadow, fill) canvas item IDs
         self.drag_data = {"piece": None, "from_square": None, "item": None, "is_white": None}
+        self._redraw_pending = False  # Ghost repaint scheduled for the next idle cycle
+        self._pending_drag_xy = None
         
         self._setup_styles()
         self._create_ui()
+        self._board_bg = self._render_board_background()
+        self._create_board_items()
         self._draw_board()
         self._draw_sidebar()
     
@@ -200,6 +270,15 @@ class ChessBoardGUI:
         self.board_canvas.bind('<B1-Motion>', self._on_drag)
         self.board_canvas.bind('<ButtonRelease-1>', self._on_release)
         self.board_canvas.bind('<Button-3>', self._on_right_click)
+        
+        # Track where the board sits on screen; the toplevel sees Configure events
+        # for window moves as well as for the canvas itself
+        self._board_root_xy = (0, 0)
+        self.root.bind('<Configure>', self._cache_board_origin, add='+')
+    
+    def _cache_board_origin(self, event=None):
+        """Cache the screen position of the board canvas for the drag handlers."""
+        self._board_root_xy = (self.board_canvas.winfo_rootx(), self.board_canvas.winfo_rooty())
     
     def _create_controls(self):
         """Create the control panel."""
@@ -269,84 +348,180 @@ class ChessBoardGUI:
     
     def _draw_sidebar(self):
         """Draw pieces in the sidebars."""
-        # Black pieces - dark colored with light outline
+        dx, dy = self.SHADOW_OFFSET
+        
+        # Black pieces - dark colored with light shadow
         self.black_canvas.delete('all')
         for i, pt in enumerate(self.PIECE_TYPES):
             y = i * 32 + 20
             symbol = self.PIECES[pt.lower()]
-            # Draw outline
-            for dx, dy in [(-1,0), (1,0), (0,-1), (0,1)]:
-                self.black_canvas.create_text(30+dx, y+dy, text=symbol,
-                    font=('Arial', 24), fill='#888')
+            # Draw shadow
+            self.black_canvas.create_text(30+dx, y+dy, text=symbol,
+                font=('Arial', 24), fill='#888')
             # Draw piece in dark color
             self.black_canvas.create_text(30, y, text=symbol,
                                            font=('Arial', 24), fill='#1a1a2e',
                                            tags=f'piece_{pt.lower()}')
         
-        # White pieces - light colored with dark outline
+        # White pieces - light colored with dark shadow
         self.white_canvas.delete('all')
         for i, pt in enumerate(self.PIECE_TYPES):
             y = i * 32 + 20
             symbol = self.PIECES[pt]
-            # Draw outline
-            for dx, dy in [(-1,0), (1,0), (0,-1), (0,1)]:
-                self.white_canvas.create_text(30+dx, y+dy, text=symbol,
-                    font=('Arial', 24), fill='#1a1a2e')
+            # Draw shadow
+            self.white_canvas.create_text(30+dx, y+dy, text=symbol,
+                font=('Arial', 24), fill='#1a1a2e')
             # Draw piece in light color
             self.white_canvas.create_text(30, y, text=symbol,
                                            font=('Arial', 24), fill='#f5f5f5',
                                            tags=f'piece_{pt}')
     
-    def _draw_board(self):
-        """Draw the chess board and pieces."""
-        self.board_canvas.delete('all')
-        
-        # Draw squares
+    def _render_board_background(self):
+        """Render the 64 squares once into an image reused by every redraw."""
+        image = tk.PhotoImage(width=self.BOARD_SIZE, height=self.BOARD_SIZE)
         for rank in range(8):
             for file in range(8):
                 x1 = file * self.SQUARE_SIZE
                 y1 = (7 - rank) * self.SQUARE_SIZE  # Flip so white is at bottom
-                x2 = x1 + self.SQUARE_SIZE
-                y2 = y1 + self.SQUARE_SIZE
                 
                 # Alternate colors (a1 should be dark, so when rank+file is even, it's dark)
                 color = self.DARK_SQUARE if (rank + file) % 2 == 0 else self.LIGHT_SQUARE
-                
-                # Highlight if this square is involved in drag
-                square = rank * 8 + file
-                if self.drag_data["from_square"] == square:
-                    color = self.HIGHLIGHT_SQUARE
-                
-                self.board_canvas.create_rectangle(x1, y1, x2, y2, fill=color, 
-                                                    outline='', tags=f'sq_{square}')
+                image.put(color, to=(x1, y1, x1 + self.SQUARE_SIZE, y1 + self.SQUARE_SIZE))
+        return image
+    
+    def _create_board_items(self):
+        """Create the canvas items that persist across redraws."""
+        # Squares from the cached background
+        self.board_canvas.create_image(0, 0, anchor='nw', image=self._board_bg, tags='bg')
         
-        # Draw pieces
-        for square in SQUARES:
-            piece = self.board.piece_at(square)
-            if piece and square != self.drag_data["from_square"]:
-                file = square % 8
-                rank = square // 8
-                x = file * self.SQUARE_SIZE + self.SQUARE_SIZE // 2
-                y = (7 - rank) * self.SQUARE_SIZE + self.SQUARE_SIZE // 2
-                
-                symbol = self.PIECES[piece.symbol()]
-                # White pieces = light color, Black pieces = dark color
-                color = '#f5f5f5' if piece.color else '#1a1a2e'
-                
-                # Draw piece with outline for visibility
-                for dx, dy in [(-1,-1), (-1,1), (1,-1), (1,1), (-1,0), (1,0), (0,-1), (0,1)]:
-                    outline_color = '#1a1a2e' if piece.color else '#f5f5f5'
-                    self.board_canvas.create_text(x+dx, y+dy, text=symbol,
-                                                   font=('Arial', 40), fill=outline_color)
-                
-                self.board_canvas.create_text(x, y, text=symbol, font=('Arial', 40),
-                                               fill=color, tags=f'piece_{square}')
+        # Highlight for the square involved in drag, hidden until needed
+        self._highlight_item = self.board_canvas.create_rectangle(
+            0, 0, self.SQUARE_SIZE, self.SQUARE_SIZE, fill=self.HIGHLIGHT_SQUARE,
+            outline='', state='hidden', tags='highlight')
         
-        # Draw rank labels on left side
+        # Rank labels on left side
         for rank in range(8):
             y = (7 - rank) * self.SQUARE_SIZE + self.SQUARE_SIZE // 2
             self.board_canvas.create_text(10, y, text=str(rank + 1), 
-                                           font=('Arial', 10, 'bold'), fill='#666')
+                                           font=('Arial', 10, 'bold'), fill='#666',
+                                           tags='rank_label')
+        
+        # Square -> (piece symbol, canvas item IDs) for the pieces currently drawn
+        self._piece_items = {}
+    
+    def _create_glyph(self, x, y, piece_symbol, tags):
+        """Draw a piece glyph with a contrasting shadow; returns (shadow, fill) item IDs."""
+        symbol = self.PIECES[piece_symbol]
+        is_white = piece_symbol.isupper()
+        # White pieces = light color, Black pieces = dark color
+        color = '#f5f5f5' if is_white else '#1a1a2e'
+        outline_color = '#1a1a2e' if is_white else '#f5f5f5'
+        
+        dx, dy = self.SHADOW_OFFSET
+        shadow = self.board_canvas.create_text(x+dx, y+dy, text=symbol, font=('Arial', 40),
+                                                fill=outline_color, tags=tags)
+        fill = self.board_canvas.create_text(x, y, text=symbol, font=('Arial', 40),
+                                              fill=color, tags=tags)
+        return shadow, fill
+    
+    def _create_piece_items(self, square, piece_symbol):
+        """Create the canvas items for a piece on a square."""
+        x, y = self._square_to_coords(square)
+        return self._create_glyph(x, y, piece_symbol, 'piece')
+    
+    def _draw_board(self):
+        """Update the board canvas to match the current position."""
+        # Highlight if a square is involved in drag
+        square = self.drag_data["from_square"]
+        if square is None:
+            self.board_canvas.itemconfigure(self._highlight_item, state='hidden')
+        else:
+            x1 = (square % 8) * self.SQUARE_SIZE
+            y1 = (7 - square // 8) * self.SQUARE_SIZE
+            self.board_canvas.coords(self._highlight_item, x1, y1,
+                                     x1 + self.SQUARE_SIZE, y1 + self.SQUARE_SIZE)
+            self.board_canvas.itemconfigure(self._highlight_item, state='normal')
+        
+        # Work out which piece should be shown on each square
+        # (piece_map only visits occupied squares)
+        wanted = {}
+        for square, piece in self.board.piece_map().items():
+            if square != self.drag_data["from_square"]:
+                wanted[square] = piece.symbol()
+        
+        # Take back the items of squares that no longer show the same piece
+        spare = {}
+        for square, (piece_symbol, items) in list(self._piece_items.items()):
+            if wanted.get(square) != piece_symbol:
+                del self._piece_items[square]
+                spare.setdefault(piece_symbol, []).append((square, items))
+        
+        # Fill the remaining squares, moving spare items of the same piece where possible
+        created = False
+        for square, piece_symbol in wanted.items():
+            if square in self._piece_items:
+                continue
+            if spare.get(piece_symbol):
+                old_square, items = spare[piece_symbol].pop()
+                old_x, old_y = self._square_to_coords(old_square)
+                x, y = self._square_to_coords(square)
+                for item in items:
+                    self.board_canvas.move(item, x - old_x, y - old_y)
+            else:
+                items = self._create_piece_items(square, piece_symbol)
+                created = True
+            self._piece_items[square] = (piece_symbol, items)
+        
+        # Anything left over is no longer on the board
+        for leftovers in spare.values():
+            for _, items in leftovers:
+                self.board_canvas.delete(*items)
+        
+        # Keep rank labels above newly created pieces
+        if created:
+            self.board_canvas.tag_raise('rank_label')
+    
+    def _repaint_squares(self, squares):
+        """Update only the given squares to match the board."""
+        created = False
+        for square in squares:
+            piece = self.board.piece_at(square)
+            piece_symbol = piece.symbol() if piece else None
+            drawn = self._piece_items.get(square)
+            if drawn and drawn[0] == piece_symbol:
+                continue
+            if drawn:
+                self.board_canvas.delete(*drawn[1])
+                del self._piece_items[square]
+            if piece_symbol:
+                self._piece_items[square] = (piece_symbol,
+                                             self._create_piece_items(square, piece_symbol))
+                created = True
+        
+        # Keep rank labels above newly created pieces
+        if created:
+            self.board_canvas.tag_raise('rank_label')
+    
+    def _hide_square(self, square):
+        """Take the piece drawn on a square off the canvas, leaving the board as it is."""
+        drawn = self._piece_items.pop(square, None)
+        if drawn:
+            self.board_canvas.delete(*drawn[1])
+    
+    def _move_squares(self, move):
+        """Squares whose contents change when move is played on the current board."""
+        squares = {move.from_square, move.to_square}
+        if self.board.is_castling(move):
+            # The rook moves too: from the corner next to the king's target
+            back_rank = move.from_square // 8 * 8
+            if self.board.is_kingside_castling(move):
+                squares.update((back_rank + 7, back_rank + 5))
+            else:
+                squares.update((back_rank, back_rank + 3))
+        elif self.board.is_en_passant(move):
+            # The captured pawn sits beside the capturing pawn's origin
+            squares.add(move.from_square // 8 * 8 + move.to_square % 8)
+        return squares
     
     def _coords_to_square(self, x, y):
         """Convert canvas coordinates to chess square index."""
@@ -358,11 +533,7 @@ class ChessBoardGUI:
     
     def _square_to_coords(self, square):
         """Convert chess square index to canvas center coordinates."""
-        file = square % 8
-        rank = square // 8
-        x = file * self.SQUARE_SIZE + self.SQUARE_SIZE // 2
-        y = (7 - rank) * self.SQUARE_SIZE + self.SQUARE_SIZE // 2
-        return x, y
+        return self._square_centers[square]
     
     def _sidebar_press(self, event, is_white):
         """Handle press on sidebar piece."""
@@ -374,57 +545,23 @@ class ChessBoardGUI:
             self.drag_data["from_square"] = None
             self.drag_data["is_white"] = is_white
             
-            # Create ghost piece on the board canvas
-            symbol = self.PIECES[piece_symbol]
-            # White = light, Black = dark
-            color = '#f5f5f5' if is_white else '#1a1a2e'
-            
             # Get position relative to board canvas
-            board_x = self.board_canvas.winfo_rootx()
-            board_y = self.board_canvas.winfo_rooty()
+            board_x, board_y = self._board_root_xy
             x = event.x_root - board_x
             y = event.y_root - board_y
             
-            # Draw outline for visibility
-            outline_color = '#1a1a2e' if is_white else '#f5f5f5'
-            for dx, dy in [(-1,-1), (-1,1), (1,-1), (1,1)]:
-                self.board_canvas.create_text(x+dx, y+dy, text=symbol, 
-                    font=('Arial', 40), fill=outline_color, tags='ghost_outline')
-            
-            self.drag_data["item"] = self.board_canvas.create_text(
-                x, y, text=symbol, font=('Arial', 40), fill=color, tags='ghost'
-            )
+            # Create ghost piece on the board canvas
+            self.drag_data["item"] = self._create_glyph(x, y, piece_symbol, 'ghost')
             self._show_status(f"Drag to place {'white' if is_white else 'black'} {piece_type}")
     
     def _sidebar_drag(self, event):
         """Handle dragging from sidebar."""
         if self.drag_data["piece"]:
             # Get position relative to board canvas
-            board_x = self.board_canvas.winfo_rootx()
-            board_y = self.board_canvas.winfo_rooty()
+            board_x, board_y = self._board_root_xy
             x = event.x_root - board_x
             y = event.y_root - board_y
-            
-            symbol = self.PIECES[self.drag_data["piece"]]
-            is_white = self.drag_data.get("is_white", self.drag_data["piece"].isupper())
-            
-            # Colors: white = light piece with dark outline, black = dark piece with light outline
-            piece_color = '#f5f5f5' if is_white else '#1a1a2e'
-            outline_color = '#1a1a2e' if is_white else '#f5f5f5'
-            
-            # Delete old ghost items
-            self.board_canvas.delete('ghost')
-            self.board_canvas.delete('ghost_outline')
-            
-            # Draw outline for visibility
-            for dx, dy in [(-1,-1), (-1,1), (1,-1), (1,1)]:
-                self.board_canvas.create_text(x+dx, y+dy, text=symbol,
-                    font=('Arial', 40), fill=outline_color, tags='ghost_outline')
-            
-            # Draw ghost piece
-            self.drag_data["item"] = self.board_canvas.create_text(
-                x, y, text=symbol, font=('Arial', 40), fill=piece_color, tags='ghost'
-            )
+            self._schedule_drag_redraw(x, y)
     
     def _on_click(self, event):
         """Handle click on board."""
@@ -443,56 +580,43 @@ class ChessBoardGUI:
             self._draw_board()
             
             # Now create ghost on top
-            symbol = self.PIECES[piece.symbol()]
-            # White pieces = light, Black pieces = dark
-            color = '#f5f5f5' if piece.color else '#1a1a2e'
-            outline_color = '#1a1a2e' if piece.color else '#f5f5f5'
-            
-            # Draw outline for visibility
-            for dx, dy in [(-1,-1), (-1,1), (1,-1), (1,1)]:
-                self.board_canvas.create_text(event.x+dx, event.y+dy, text=symbol,
-                    font=('Arial', 40), fill=outline_color, tags='ghost_outline')
-            
-            self.drag_data["item"] = self.board_canvas.create_text(
-                event.x, event.y, text=symbol, font=('Arial', 40), fill=color, tags='ghost'
-            )
+            self.drag_data["item"] = self._create_glyph(event.x, event.y, piece.symbol(), 'ghost')
     
     def _on_drag(self, event):
         """Handle drag motion on board."""
         if self.drag_data["piece"]:
-            symbol = self.PIECES[self.drag_data["piece"]]
-            is_white = self.drag_data.get("is_white", self.drag_data["piece"].isupper())
-            
-            # Colors: white = light piece with dark outline, black = dark piece with light outline
-            piece_color = '#f5f5f5' if is_white else '#1a1a2e'
-            outline_color = '#1a1a2e' if is_white else '#f5f5f5'
-            
-            # Delete old ghost items
-            self.board_canvas.delete('ghost')
-            self.board_canvas.delete('ghost_outline')
-            
-            # Draw outline for visibility
-            for dx, dy in [(-1,-1), (-1,1), (1,-1), (1,1)]:
-                self.board_canvas.create_text(event.x+dx, event.y+dy, text=symbol,
-                    font=('Arial', 40), fill=outline_color, tags='ghost_outline')
-            
-            # Draw ghost piece
-            self.drag_data["item"] = self.board_canvas.create_text(
-                event.x, event.y, text=symbol, font=('Arial', 40), fill=piece_color, tags='ghost'
-            )
+            self._schedule_drag_redraw(event.x, event.y)
+    
+    def _schedule_drag_redraw(self, x, y):
+        """Remember the latest drag position and repaint the ghost once Tk is idle."""
+        self._pending_drag_xy = (x, y)
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.root.after_idle(self._flush_drag_redraw)
+    
+    def _flush_drag_redraw(self):
+        """Move the ghost piece to the latest drag position."""
+        self._redraw_pending = False
+        if not self.drag_data["item"] or self._pending_drag_xy is None:
+            return
+        
+        x, y = self._pending_drag_xy
+        dx, dy = self.SHADOW_OFFSET
+        shadow, fill = self.drag_data["item"]
+        self.board_canvas.coords(shadow, x + dx, y + dy)
+        self.board_canvas.coords(fill, x, y)
     
     def _on_release(self, event):
         """Handle mouse release."""
         if not self.drag_data["piece"]:
             return
         
-        # Delete ghost and outline
-        self.board_canvas.delete('ghost')
-        self.board_canvas.delete('ghost_outline')
+        # Delete the ghost piece
+        if self.drag_data["item"]:
+            self.board_canvas.delete(*self.drag_data["item"])
         
         # Get coordinates relative to board canvas
-        board_x = self.board_canvas.winfo_rootx()
-        board_y = self.board_canvas.winfo_rooty()
+        board_x, board_y = self._board_root_xy
         rel_x = event.x_root - board_x
         rel_y = event.y_root - board_y
         
@@ -524,25 +648,66 @@ class ChessBoardGUI:
             self._clear_piece(self.drag_data["from_square"])
         
         # Reset drag state
+        from_sq = self.drag_data["from_square"]
         self.drag_data = {"piece": None, "from_square": None, "item": None, "is_white": None}
-        self._draw_board()
+        if self.animating:
+            # Leave the static frame alone; the animation repaints its own squares
+            # when it ends, but the dragged piece's origin was hidden by the click
+            self.board_canvas.itemconfigure(self._highlight_item, state='hidden')
+            if from_sq is not None:
+                self._repaint_squares((from_sq,))
+        else:
+            self._draw_board()
     
     def _on_right_click(self, event):
         """Handle right click to remove piece."""
         square = self._coords_to_square(event.x, event.y)
         if square is not None:
             self._clear_piece(square)
-            self._draw_board()
     
     def _set_piece(self, square, piece_symbol):
         """Set a piece on the board."""
         self.board.set_piece_at(square, Piece.from_symbol(piece_symbol))
-        self._draw_board()
+        self._record_edit()
+        self._repaint_squares((square,))
     
     def _clear_piece(self, square):
         """Remove a piece from the board."""
         self.board.remove_piece_at(square)
-        self._draw_board()
+        self._record_edit()
+        self._repaint_squares((square,))
+    
+    def _record_edit(self):
+        """
+        Store the edited board as the position being viewed. Editing clears the
+        board's move stack, so the board now starts a new history segment.
+        """
+        self._history.set_position(self.current_move_index, self.board.fen())
+    
+    def _segment_start(self):
+        """Index of the position the board's move stack starts from."""
+        return self.current_move_index - len(self.board.move_stack)
+    
+    def _load_position(self, index):
+        """Step the board in place to the position after the first index moves."""
+        start, fen = self._history.segment(index)
+        if start != self._segment_start():
+            self.board.set_fen(fen)
+            self.current_move_index = start
+        while self.current_move_index > index:
+            self.board.pop()
+            self.current_move_index -= 1
+        while self.current_move_index < index:
+            self.board.push(self._history.moves[self.current_move_index])
+            self.current_move_index += 1
+    
+    def _discard_future_moves(self):
+        """Drop the moves after the one being viewed; they no longer follow from the board."""
+        if self.current_move_index < len(self._history):
+            self._history.truncate(self.current_move_index)
+            self._truncate_history_display()
+            self._update_nav_label()
+            self._highlight_current_move()
     
     def _execute_move(self):
         """Execute move from the entry field."""
@@ -551,8 +716,7 @@ class ChessBoardGUI:
             return
         
         try:
-            parser = DescriptiveNotationParser(self.board)
-            move = parser.parse(notation)
+            move = self._parser.parse(notation)
             
             if move and move in self.board.legal_moves:
                 self._make_move(move, notation)
@@ -566,35 +730,31 @@ class ChessBoardGUI:
     def _make_move(self, move, notation=None, animate=True):
         """Make a move on the board."""
         # If we're not at the end, truncate future moves
-        if self.current_move_index < len(self.board_states) - 1:
-            self.board_states = self.board_states[:self.current_move_index + 1]
-            self.move_history = self.move_history[:self.current_move_index]
-            self.move_notations = self.move_notations[:self.current_move_index]
-            self._rebuild_history_display()
-        
-        self.move_history.append(self.board.fen())
+        self._discard_future_moves()
         
         # Generate descriptive notation before pushing
         if notation is None:
             notation = MoveToDescriptive.convert(self.board, move)
         
-        self.move_notations.append(notation)
+        self._history.append(move, notation)
         
         from_sq = move.from_square
         to_sq = move.to_square
         piece = self.board.piece_at(from_sq)
+        dirty_squares = self._move_squares(move)
         
-        self.board.push(move)
+        # Show the position before the move without the moving piece at its origin
+        if animate and piece:
+            self._hide_square(from_sq)
         
-        # Store the new board state
-        self.board_states.append(self.board.fen())
-        self.current_move_index = len(self.board_states) - 1
+        self.board.push(move)
+        self.current_move_index += 1
         
-        # Animate or just draw
+        # Animate or just repaint the squares the move touched
         if animate and piece:
-            self._animate_piece_move_forward(from_sq, to_sq, piece)
+            self._animate_piece_move(from_sq, to_sq, piece, dirty_squares)
         else:
-            self._draw_board()
+            self._repaint_squares(dirty_squares)
         
         self._update_turn()
         self._add_history(notation)
@@ -602,63 +762,53 @@ class ChessBoardGUI:
         self._highlight_current_move()
         self._check_game_state()
     
-    def _animate_piece_move_forward(self, from_sq, to_sq, piece):
-        """Animate a piece moving forward (for making moves)."""
+    def _animate_piece_move(self, from_sq, to_sq, piece, dirty_squares):
+        """
+        Animate a piece moving from one square to another, then repaint dirty_squares.
+        The canvas should already show the position before the animation with
+        the moving piece left off from_sq.
+        """
         self.animating = True
         
         # Get coordinates
         start_x, start_y = self._square_to_coords(from_sq)
         end_x, end_y = self._square_to_coords(to_sq)
         
-        # Calculate step sizes
-        dx = (end_x - start_x) / self.animation_steps
-        dy = (end_y - start_y) / self.animation_steps
-        step_delay = self.animation_duration // self.animation_steps
-        
-        # Draw board without the moving piece at its origin
-        temp_board = Board(self.move_history[-1])  # Board before the move
-        temp_board.remove_piece_at(from_sq)
-        old_board = self.board
-        self.board = temp_board
-        self._draw_board()
-        self.board = old_board
+        # Positions follow the clock, so the move takes animation_duration
+        # however often Tk actually gets round to running the frames
+        duration = self.animation_duration / 1000
+        start_time = time.monotonic()
         
-        # Create the animated piece
-        symbol = self.PIECES[piece.symbol()]
-        color = '#f5f5f5' if piece.color else '#1a1a2e'
-        outline_color = '#1a1a2e' if piece.color else '#f5f5f5'
+        # Create the animated piece once; each step only repositions it
+        shadow, fill = self._create_glyph(start_x, start_y, piece.symbol(), 'animated')
+        sdx, sdy = self.SHADOW_OFFSET
         
-        def animate_step(step, x, y):
-            if step > self.animation_steps:
+        def animate_step():
+            t = (time.monotonic() - start_time) / duration
+            if t >= 1.0:
                 # Animation complete
-                self._draw_board()
+                self.board_canvas.delete(shadow, fill)
+                self._repaint_squares(dirty_squares)
                 self.animating = False
                 return
             
-            # Clear previous animated piece
-            self.board_canvas.delete('animated')
-            
-            # Draw piece at current position with outline
-            for ddx, ddy in [(-1,-1), (-1,1), (1,-1), (1,1), (-1,0), (1,0), (0,-1), (0,1)]:
-                self.board_canvas.create_text(x+ddx, y+ddy, text=symbol,
-                    font=('Arial', 40), fill=outline_color, tags='animated')
-            self.board_canvas.create_text(x, y, text=symbol,
-                font=('Arial', 40), fill=color, tags='animated')
+            # Move the animated piece to its current position
+            x = start_x + (end_x - start_x) * t
+            y = start_y + (end_y - start_y) * t
+            self.board_canvas.coords(shadow, x + sdx, y + sdy)
+            self.board_canvas.coords(fill, x, y)
             
-            # Schedule next step
-            self.root.after(step_delay, lambda: animate_step(step + 1, x + dx, y + dy))
+            # Schedule next frame
+            self.root.after(self.animation_frame_delay, animate_step)
         
         # Start animation
-        animate_step(0, start_x, start_y)
+        animate_step()
     
-    def _rebuild_history_display(self):
-        """Rebuild the history display from move_notations."""
+    def _truncate_history_display(self):
+        """Remove the history lines of moves no longer in the history."""
         self.history_text.config(state=tk.NORMAL)
-        self.history_text.delete(1.0, tk.END)
-        for i, notation in enumerate(self.move_notations):
-            num = i + 1
-            who = "W" if num % 2 == 1 else "B"
-            self.history_text.insert(tk.END, f"{num}. {who}: {notation}\n")
+        # One line per move, so everything from the line after the last kept move goes
+        self.history_text.delete(f"{len(self._history) + 1}.0", tk.END)
         self.history_text.config(state=tk.DISABLED)
     
     def _update_turn(self):
@@ -669,7 +819,7 @@ class ChessBoardGUI:
     def _add_history(self, notation):
         """Add move to history in descriptive notation."""
         self.history_text.config(state=tk.NORMAL)
-        num = len(self.move_history)
+        num = len(self._history)
         who = "W" if num % 2 == 1 else "B"
         self.history_text.insert(tk.END, f"{num}. {who}: {notation}\n")
         self.history_text.see(tk.END)
@@ -692,10 +842,8 @@ class ChessBoardGUI:
     
     def _reset_board(self):
         """Reset to starting position."""
-        self.board = Board()
-        self.move_history = []
-        self.move_notations = []
-        self.board_states = [Board().fen()]
+        self.board.reset()
+        self._history = MoveHistory(self.board.fen())
         self.current_move_index = 0
         self.history_text.config(state=tk.NORMAL)
         self.history_text.delete(1.0, tk.END)
@@ -708,9 +856,7 @@ class ChessBoardGUI:
     def _clear_board(self):
         """Clear the board completely."""
         self.board.clear()
-        self.move_history = []
-        self.move_notations = []
-        self.board_states = [self.board.fen()]
+        self._history = MoveHistory(self.board.fen())
         self.current_move_index = 0
         self.history_text.config(state=tk.NORMAL)
         self.history_text.delete(1.0, tk.END)
@@ -721,21 +867,20 @@ class ChessBoardGUI:
     
     def _undo_move(self):
         """Undo last move (removes it from history)."""
-        if len(self.board_states) > 1:
-            # Remove the last state
-            self.board_states.pop()
-            if self.move_history:
-                self.move_history.pop()
-            if self.move_notations:
-                self.move_notations.pop()
-            
-            # Go to the new end
-            self.current_move_index = len(self.board_states) - 1
-            self.board = Board(self.board_states[self.current_move_index])
-            
-            self._draw_board()
+        if self._history:
+            # Go to the position before the last move and forget the move
+            last = len(self._history) - 1
+            if self.current_move_index == last + 1 and self.board.move_stack:
+                # Only the squares of the undone move changed on screen
+                dirty_squares = self._move_squares(self.board.pop())
+                self.current_move_index = last
+                self._repaint_squares(dirty_squares)
+            else:
+                self._load_position(last)
+                self._draw_board()
+            self._history.truncate(last)
             self._update_turn()
-            self._rebuild_history_display()
+            self._truncate_history_display()
             self._update_nav_label()
             self._highlight_current_move()
             
@@ -745,15 +890,13 @@ class ChessBoardGUI:
     
     def _switch_turn(self):
         """Switch whose turn it is (white/black)."""
-        # Get current FEN and modify the turn
-        fen_parts = self.board.fen().split(' ')
-        # Toggle turn: 'w' -> 'b', 'b' -> 'w'
-        fen_parts[1] = 'b' if fen_parts[1] == 'w' else 'w'
-        new_fen = ' '.join(fen_parts)
-        
-        self.board = Board(new_fen)
-        self._update_turn()
-        self._draw_board()
+        # Toggle the turn in place, as an edit of the position being viewed;
+        # an en passant square is never valid for the other side
+        self.board.turn = not self.board.turn
+        self.board.ep_square = None
+        self.board.clear_stack()
+        self._record_edit()
+        self._update_turn()  # No pieces moved, so the board canvas is left alone
         turn_name = "White" if self.board.turn else "Black"
         self._show_status(f"Switched to {turn_name}'s turn")
     
@@ -769,133 +912,57 @@ class ChessBoardGUI:
     
     def _go_forward(self):
         """Go forward one move."""
-        if self.current_move_index < len(self.board_states) - 1:
+        if self.current_move_index < len(self._history):
             self._navigate_to_move(self.current_move_index + 1)
     
     def _go_to_end(self):
         """Go to the latest position."""
-        if self.current_move_index < len(self.board_states) - 1:
-            self._navigate_to_move(len(self.board_states) - 1)
+        if self.current_move_index < len(self._history):
+            self._navigate_to_move(len(self._history))
     
     def _navigate_to_move(self, index, animate=True):
         """Navigate to a specific move index."""
         if self.animating:
             return
         
-        old_index = self.current_move_index
-        self.current_move_index = index
-        
-        # Get the board state at this index
-        target_fen = self.board_states[index]
-        
-        if animate and abs(index - old_index) == 1:
+        # Only a move inside one history segment can be animated; the first
+        # position of a segment was set up, not reached by a move
+        if (animate and abs(index - self.current_move_index) == 1
+                and self._history.segment(index)[0] == self._segment_start()):
             # Single move - animate it
-            self._animate_navigation(old_index, index)
+            if index > self.current_move_index:
+                # Going forward - replay the next move
+                move = self._history.moves[self.current_move_index]
+                from_sq, to_sq = move.from_square, move.to_square
+                piece = self.board.piece_at(from_sq)
+                dirty_squares = self._move_squares(move)
+                self._hide_square(from_sq)
+                self.board.push(move)
+            else:
+                # Going backward - take the move back
+                move = self.board.peek()
+                from_sq, to_sq = move.to_square, move.from_square
+                piece = self.board.piece_at(from_sq)
+                self._hide_square(from_sq)
+                self.board.pop()
+                dirty_squares = self._move_squares(move)
+            self.current_move_index = index
+            self._animate_piece_move(from_sq, to_sq, piece, dirty_squares)
         else:
-            # Multiple moves or no animation - just set the position
-            self.board = Board(target_fen)
+            # Multiple moves or no animation - just step to the position
+            self._load_position(index)
             self._draw_board()
         
         self._update_turn()
         self._update_nav_label()
         self._highlight_current_move()
     
-    def _animate_navigation(self, from_index, to_index):
-        """Animate navigation between adjacent moves."""
-        if from_index < to_index:
-            # Going forward - animate the move that was made
-            old_board = Board(self.board_states[from_index])
-            new_board = Board(self.board_states[to_index])
-        else:
-            # Going backward - animate the reverse of the move
-            old_board = Board(self.board_states[from_index])
-            new_board = Board(self.board_states[to_index])
-        
-        # Find what changed between boards
-        from_square = None
-        to_square = None
-        moving_piece = None
-        
-        for sq in SQUARES:
-            old_piece = old_board.piece_at(sq)
-            new_piece = new_board.piece_at(sq)
-            
-            if old_piece and not new_piece:
-                if from_square is None:
-                    from_square = sq
-                    moving_piece = old_piece
-            elif new_piece and not old_piece:
-                to_square = sq
-                if moving_piece is None:
-                    moving_piece = new_piece
-            elif old_piece and new_piece and old_piece.symbol() != new_piece.symbol():
-                # Piece changed (capture or replacement)
-                if from_square is None:
-                    from_square = sq
-                    moving_piece = old_piece
-                to_square = sq
-        
-        if from_square is not None and to_square is not None and moving_piece:
-            self._animate_piece_move(from_square, to_square, moving_piece, new_board)
-        else:
-            # Can't determine animation, just update
-            self.board = new_board
-            self._draw_board()
-    
-    def _animate_piece_move(self, from_sq, to_sq, piece, final_board):
-        """Animate a piece moving from one square to another."""
-        self.animating = True
-        
-        # Get coordinates
-        start_x, start_y = self._square_to_coords(from_sq)
-        end_x, end_y = self._square_to_coords(to_sq)
-        
-        # Calculate step sizes
-        dx = (end_x - start_x) / self.animation_steps
-        dy = (end_y - start_y) / self.animation_steps
-        step_delay = self.animation_duration // self.animation_steps
-        
-        # Draw board without the moving piece
-        temp_board = Board(self.board.fen())
-        temp_board.remove_piece_at(from_sq)
-        self.board = temp_board
-        self._draw_board()
-        
-        # Create the animated piece
-        symbol = self.PIECES[piece.symbol()]
-        color = '#f5f5f5' if piece.color else '#1a1a2e'
-        outline_color = '#1a1a2e' if piece.color else '#f5f5f5'
-        
-        def animate_step(step, x, y):
-            if step > self.animation_steps:
-                # Animation complete
-                self.board = final_board
-                self._draw_board()
-                self.animating = False
-                return
-            
-            # Clear previous animated piece
-            self.board_canvas.delete('animated')
-            
-            # Draw piece at current position with outline
-            for ddx, ddy in [(-1,-1), (-1,1), (1,-1), (1,1), (-1,0), (1,0), (0,-1), (0,1)]:
-                self.board_canvas.create_text(x+ddx, y+ddy, text=symbol,
-                    font=('Arial', 40), fill=outline_color, tags='animated')
-            self.board_canvas.create_text(x, y, text=symbol,
-                font=('Arial', 40), fill=color, tags='animated')
-            
-            # Schedule next step
-            self.root.after(step_delay, lambda: animate_step(step + 1, x + dx, y + dy))
-        
-        # Start animation
-        animate_step(0, start_x, start_y)
-    
     def _update_nav_label(self):
         """Update the navigation position label."""
         if self.current_move_index == 0:
             self.move_label.config(text="Start")
         else:
-            total = len(self.board_states) - 1
+            total = len(self._history)
             self.move_label.config(text=f"{self.current_move_index}/{total}")
     
     def _highlight_current_move(self):
@@ -15,25 +15,48 @@ Aaron Beckley December 17, 2025
 
 """
 
+import functools
 import re
-from typing import Optional, Tuple
-from chess import Board, Move, Square
+from typing import Iterable, List, Optional, Tuple
+from chess import C1, C8, E1, E8, G1, G8, KING, Board, Move, scan_reversed
+
+
+# Patterns used on every parse, compiled once
+# Check/checkmate indicators and en passant notation
+_SUFFIX_RE = re.compile(r'\s*(ch|check|\+|mate|#|e\.?\s*p\.?).*$', re.IGNORECASE)
+_PROMOTION_RE = re.compile(r'P-([A-Z]+)(\d+)\(([QRBN])\)')
+_RANK_RE = re.compile(r'(\d+)')
+
+# Tables for str.translate: drop move separators and capture marks in one pass
+_STRIP_TABLE = str.maketrans('', '', '-xX')
+_STRIP_CAPTURE_TABLE = str.maketrans('', '', 'xX')
+
+# Standard rank (0-7) of each descriptive rank (1-8, counted from the mover's
+# side), indexed by the side to move and then by rank - 1
+_STANDARD_RANKS = (bytes(range(7, -1, -1)), bytes(range(8)))
 
 
 class DescriptiveNotationParser:
     """Parser for converting Descriptive Notation to standard chess moves."""
     
-    # File mapping: Descriptive -> Standard (a-h)
+    # Every attribute set in __init__; no per-instance __dict__
+    __slots__ = ('board', 'is_white_turn', '_ranks', '_legal_moves', '_by_to',
+                 '_by_piece_type', '_resolve')
+    
+    # File mapping: Descriptive -> Standard file index (0-7 for a-h)
     FILE_MAP = {
-        'QR': 'a', 'QN': 'b', 'QB': 'c', 'Q': 'd',
-        'K': 'e', 'KB': 'f', 'KN': 'g', 'KR': 'h'
+        'QR': 0, 'QN': 1, 'QB': 2, 'Q': 3,
+        'K': 4, 'KB': 5, 'KN': 6, 'KR': 7
     }
     
+    # File names spelled with two letters
+    TWO_LETTER_FILES = frozenset(['QR', 'QN', 'QB', 'KR', 'KN', 'KB'])
+    
     # Abbreviated file names (ambiguous - could be Q-side or K-side)
     AMBIGUOUS_FILES = {
-        'R': ['a', 'h'],   # QR or KR
-        'N': ['b', 'g'],   # QN or KN  
-        'B': ['c', 'f'],   # QB or KB
+        'R': [0, 7],   # QR or KR
+        'N': [1, 6],   # QN or KN  
+        'B': [2, 5],   # QB or KB
     }
     
     # Reverse mapping
@@ -45,6 +68,14 @@ class DescriptiveNotationParser:
         'R': 'R', 'N': 'N', 'B': 'B', 'Q': 'Q', 'K': 'K'
     }
     
+    # Piece letters to python-chess piece types
+    _PIECE_TYPE_MAP = {'P': 1, 'R': 4, 'N': 2, 'B': 3, 'Q': 5, 'K': 6}
+    
+    # Castling king moves as (from, to) squares, indexed by side to move
+    # (Black, White); Move objects can be modified, so each parse builds its own
+    _KINGSIDE_CASTLING = ((E8, G8), (E1, G1))
+    _QUEENSIDE_CASTLING = ((E8, C8), (E1, C1))
+    
     # Qualified piece names (specify which of two pieces)
     # QR = Queen's Rook, KR = King's Rook, etc.
     QUALIFIED_PIECES = {
@@ -59,6 +90,18 @@ class DescriptiveNotationParser:
     def __init__(self, board: Board):
         self.board = board
         self.is_white_turn = board.turn
+        # Rank table for the side to move, picked again on every parse
+        self._ranks = _STANDARD_RANKS[board.turn]
+        # Legal moves of the position and the same moves by destination square
+        # and by moving piece type, filled in by parse()
+        self._legal_moves = None
+        self._by_to = None
+        self._by_piece_type = None
+        # Results by (position, notation): a position always parses the same
+        # way, so positions seen again skip the parse. Results are kept as
+        # (from, to, promotion) and each call builds its own Move, since
+        # callers may modify the Move they get back
+        self._resolve = functools.lru_cache(maxsize=4096)(self._resolve_position)
     
     def parse(self, notation: str) -> Optional[Move]:
         """
@@ -72,11 +115,61 @@ class DescriptiveNotationParser:
         - O-O-O (castling queenside)
         - PxP (pawn takes pawn)
         - NxP (knight takes pawn)
+        
+        The side to move is read from the board on every call, so one parser
+        can be reused while moves are pushed onto its board.
+        """
+        self._start_position()
+        return self._build_move(self._resolve(self._position_key(), notation))
+    
+    def parse_many(self, notations: Iterable[str]) -> List[Optional[Move]]:
+        """
+        Parse several notations against the current position, returning a
+        Move (or None) for each. The legal moves are generated once for the
+        whole batch instead of once per notation.
+        """
+        self._start_position()
+        position_key = self._position_key()
+        return [self._build_move(self._resolve(position_key, notation))
+                for notation in notations]
+    
+    def _start_position(self):
+        """Pick up the side to move and forget the previous position's moves."""
+        self.is_white_turn = self.board.turn
+        self._ranks = _STANDARD_RANKS[self.is_white_turn]
+        self._legal_moves = None
+    
+    def _position_key(self):
         """
+        Key for the board position, leaving out the move clocks: what a FEN
+        without clocks says, but far cheaper to build than the string.
+        """
+        return self.board._transposition_key()
+    
+    def _resolve_position(self, position_key, notation: str) -> Optional[Tuple[int, int, Optional[int]]]:
+        """
+        Parse notation on the board as it is now and return the move as
+        (from_square, to_square, promotion); position_key only tells the
+        lru_cache in _resolve which position that is.
+        """
+        move = self._parse_notation(notation)
+        if move is None:
+            return None
+        return move.from_square, move.to_square, move.promotion
+    
+    @staticmethod
+    def _build_move(resolved: Optional[Tuple[int, int, Optional[int]]]) -> Optional[Move]:
+        """Build a fresh Move from a cached _resolve result."""
+        if resolved is None:
+            return None
+        return Move(*resolved)
+    
+    def _parse_notation(self, notation: str) -> Optional[Move]:
+        """Parse one notation against the position set up by _start_position."""
         notation = notation.strip().upper()
         
         # Remove check/checkmate indicators and en passant notation
-        notation = re.sub(r'\s*(ch|check|\+|mate|#|e\.?\s*p\.?).*$', '', notation, flags=re.IGNORECASE)
+        notation = _SUFFIX_RE.sub('', notation)
         
         # Handle castling
         if notation == 'O-O' or notation == '0-0':
@@ -88,79 +181,97 @@ class DescriptiveNotationParser:
         if '(' in notation and ')' in notation:
             return self._parse_promotion(notation)
         
-        # Check for qualified piece names first (QR, KR, QN, KN, QB, KB)
-        # These must be followed by - or x to be piece moves (e.g., QR-K1, KN-B3)
-        for qualified in ['QR', 'KR', 'QN', 'KN', 'QB', 'KB']:
-            if notation.startswith(qualified):
-                if len(notation) > 2 and notation[2] in ['-', 'x', 'X']:
-                    return self._parse_qualified_piece_move(notation)
-                # Otherwise it's a pawn move to that file (e.g., QR4 = pawn to QR4)
-                break
-        
-        # Parse piece moves (non-pawn pieces)
-        # Check for explicit piece notation: R, N, B, Q, or K followed by - or x
-        if notation.startswith(('R', 'N', 'B', 'Q')):
-            return self._parse_piece_move(notation)
-        elif notation.startswith('K'):
-            # Could be King move (K-K2, KxP) or pawn to K file (K4, P-K4)
-            # King moves typically have K- or Kx, pawn moves have just K followed by number
-            if len(notation) > 1 and notation[1] in ['-', 'x', 'X']:
-                # Likely a king move
-                return self._parse_piece_move(notation)
-            elif notation.startswith(('KB', 'KN', 'KR')):
-                # These are file names, not king moves - treat as pawn move
-                return self._parse_pawn_move(notation)
-            else:
-                # Could be either - try king first, then pawn
-                king_move = self._parse_piece_move(notation)
-                if king_move:
-                    return king_move
-                return self._parse_pawn_move(notation)
-        else:
-            # Assume it's a pawn move (P-K4, K4, etc.)
+        # Qualified piece moves, piece moves, or pawn moves (P-K4, K4, etc.)
+        dispatch = self._DISPATCH
+        handler = (dispatch.get(notation[:3]) or dispatch.get(notation[:2])
+                   or dispatch.get(notation[:1]))
+        if handler is None:
             return self._parse_pawn_move(notation)
+        return handler(self, notation)
+    
+    def _index_legal_moves(self):
+        """
+        Generate the position's legal moves once for the helpers that need
+        them, also indexed by destination square for the helpers that know
+        their target and by piece type for the captures that don't.
+        """
+        if self._legal_moves is not None:
+            return
+        self._legal_moves = list(self.board.generate_legal_moves())
+        self._by_to = {}
+        self._by_piece_type = {1: [], 2: [], 3: [], 4: [], 5: [], 6: []}
+        piece_type_at = self.board.piece_type_at
+        for move in self._legal_moves:
+            self._by_to.setdefault(move.to_square, []).append(move)
+            self._by_piece_type[piece_type_at(move.from_square)].append(move)
+    
+    def _piece_moves_to(self, piece_type: int, target_square: int) -> List[Move]:
+        """
+        Legal moves of the side to move's pieces of piece_type (not pawns) to
+        target_square, in move generation order. Only pieces attacking the
+        square can go there, so the bitboards give the candidates without
+        generating every legal move.
+        """
+        board = self.board
+        moves = []
+        origins = (board.pieces_mask(piece_type, board.turn)
+                   & board.attackers_mask(board.turn, target_square))
+        for from_square in scan_reversed(origins):
+            move = Move(from_square, target_square)
+            if board.is_legal(move):
+                moves.append(move)
+        if piece_type == KING:
+            # Castling moves the king two squares, which it doesn't attack
+            for move in board.generate_castling_moves():
+                if move.to_square == target_square:
+                    moves.append(move)
+        return moves
+    
+    def _parse_king_or_pawn_move(self, notation: str) -> Optional[Move]:
+        """
+        Parse notation starting with K that is neither K- nor Kx nor a K-side
+        file name: it could be a king move or a pawn move to the K file (K4).
+        """
+        # Try king first, then pawn
+        king_move = self._parse_piece_move(notation)
+        if king_move:
+            return king_move
+        return self._parse_pawn_move(notation)
     
     def _parse_castling_kingside(self) -> Optional[Move]:
         """Parse kingside castling."""
-        if self.is_white_turn:
-            if self.board.has_kingside_castling_rights(True):
-                return Move.from_uci('e1g1')
-        else:
-            if self.board.has_kingside_castling_rights(False):
-                return Move.from_uci('e8g8')
+        if self.board.has_kingside_castling_rights(self.is_white_turn):
+            return Move(*self._KINGSIDE_CASTLING[self.is_white_turn])
         return None
     
     def _parse_castling_queenside(self) -> Optional[Move]:
         """Parse queenside castling."""
-        if self.is_white_turn:
-            if self.board.has_queenside_castling_rights(True):
-                return Move.from_uci('e1c1')
-        else:
-            if self.board.has_queenside_castling_rights(False):
-                return Move.from_uci('e8c8')
+        if self.board.has_queenside_castling_rights(self.is_white_turn):
+            return Move(*self._QUEENSIDE_CASTLING[self.is_white_turn])
         return None
     
     def _parse_promotion(self, notation: str) -> Optional[Move]:
         """Parse pawn promotion moves like P-K8(Q)."""
-        match = re.match(r'P-([A-Z]+)(\d+)\(([QRBN])\)', notation)
+        match = _PROMOTION_RE.match(notation)
         if not match:
             return None
         
         file_desc, rank_desc, promo_piece = match.groups()
-        target_file = self._descriptive_file_to_standard(file_desc)
-        target_rank = self._descriptive_rank_to_standard(int(rank_desc))
+        target_file = self.FILE_MAP.get(file_desc)
+        rank_desc = int(rank_desc)
         
-        if target_file is None or target_rank is None:
+        if target_file is None or not 1 <= rank_desc <= 8:
             return None
+        target_rank = self._ranks[rank_desc - 1]
         
-        target_square = self._file_rank_to_square(target_file, target_rank)
+        target_square = target_rank * 8 + target_file
         
         # Find the pawn that can move to this square
-        for move in self.board.legal_moves:
-            if move.to_square == target_square and move.promotion:
-                promo_map = {'Q': 5, 'R': 4, 'B': 3, 'N': 2}
-                if move.promotion == promo_map.get(promo_piece):
-                    return move
+        self._index_legal_moves()
+        promotion = self._PIECE_TYPE_MAP[promo_piece]
+        for move in self._by_to.get(target_square, ()):
+            if move.promotion == promotion:
+                return move
         
         return None
     
@@ -171,7 +282,7 @@ class DescriptiveNotationParser:
         notation = notation[1:]
         
         is_capture = 'x' in notation or 'X' in notation
-        notation = notation.replace('-', '').replace('x', '').replace('X', '')
+        notation = notation.translate(_STRIP_TABLE)
         
         # Handle captures like NxP, NxB, RxR - where captured piece type is specified
         if notation in ['P', 'R', 'N', 'B', 'Q', 'K', '']:
@@ -180,27 +291,11 @@ class DescriptiveNotationParser:
             return self._parse_generic_capture(piece_char, captured_type)
         
         # Parse file and rank
-        file_desc = None
+        file_desc, ambiguous_file, notation = self._match_file(notation)
         rank_desc = None
-        ambiguous_file = None
-        
-        # Try to match file patterns (longest first to avoid partial matches)
-        for file_pattern in ['QR', 'QN', 'QB', 'KR', 'KN', 'KB', 'Q', 'K']:
-            if notation.startswith(file_pattern):
-                file_desc = file_pattern
-                notation = notation[len(file_pattern):]
-                break
-        
-        # If no standard file found, check for ambiguous abbreviated files (R, N, B)
-        if file_desc is None:
-            for abbrev in ['R', 'N', 'B']:
-                if notation.startswith(abbrev):
-                    ambiguous_file = abbrev
-                    notation = notation[1:]
-                    break
         
         # Extract rank (should be a digit)
-        rank_match = re.search(r'(\d+)', notation)
+        rank_match = _RANK_RE.search(notation)
         if rank_match:
             rank_desc = int(rank_match.group(1))
         
@@ -208,15 +303,16 @@ class DescriptiveNotationParser:
             return None
         
         # Find the piece that can move to this square
-        piece_map = {'P': 1, 'R': 4, 'N': 2, 'B': 3, 'Q': 5, 'K': 6}
-        piece_type = piece_map.get(piece_char)
+        piece_type = self._PIECE_TYPE_MAP.get(piece_char)
         
         if piece_type is None:
             return None
         
-        target_rank = self._descriptive_rank_to_standard(rank_desc)
-        if target_rank is None:
+        if not 1 <= rank_desc <= 8:
             return None
+        target_rank = self._ranks[rank_desc - 1]
+        
+        piece_type_at = self.board.piece_type_at
         
         # If we have an ambiguous file, try both possibilities
         if ambiguous_file:
@@ -224,40 +320,28 @@ class DescriptiveNotationParser:
             all_candidates = []
             
             for target_file in possible_files:
-                target_square = self._file_rank_to_square(target_file, target_rank)
-                
-                for move in self.board.legal_moves:
-                    if move.to_square == target_square:
-                        piece = self.board.piece_at(move.from_square)
-                        if piece and piece.piece_type == piece_type and piece.color == self.board.turn:
-                            all_candidates.append(move)
+                target_square = target_rank * 8 + target_file
+                all_candidates.extend(self._piece_moves_to(piece_type, target_square))
             
             if len(all_candidates) == 1:
                 return all_candidates[0]
             elif len(all_candidates) > 1:
                 if is_capture:
                     for move in all_candidates:
-                        if self.board.piece_at(move.to_square):
+                        if piece_type_at(move.to_square):
                             return move
                 return all_candidates[0]
             return None
         
         # Standard file handling
-        target_file = self._descriptive_file_to_standard(file_desc)
+        target_file = self.FILE_MAP.get(file_desc)
         if target_file is None:
             return None
         
-        target_square = self._file_rank_to_square(target_file, target_rank)
+        target_square = target_rank * 8 + target_file
         
-        legal_moves = list(self.board.legal_moves)
-        
-        # Filter by target square and piece type
-        candidates = []
-        for move in legal_moves:
-            if move.to_square == target_square:
-                piece = self.board.piece_at(move.from_square)
-                if piece and piece.piece_type == piece_type and piece.color == self.board.turn:
-                    candidates.append(move)
+        # Moves of this piece type to the target square
+        candidates = self._piece_moves_to(piece_type, target_square)
         
         # If multiple candidates, try to disambiguate
         if len(candidates) == 1:
@@ -268,7 +352,7 @@ class DescriptiveNotationParser:
             if is_capture:
                 # Prefer moves that actually capture
                 for move in candidates:
-                    if self.board.piece_at(move.to_square):
+                    if piece_type_at(move.to_square):
                         return move
             # Return first valid move if can't disambiguate
             return candidates[0]
@@ -291,70 +375,54 @@ class DescriptiveNotationParser:
         piece_char, side_qualifier = piece_info  # e.g., ('R', 'Q') for QR
         
         is_capture = 'x' in notation or 'X' in notation
-        notation = notation.replace('-', '').replace('x', '').replace('X', '')
+        notation = notation.translate(_STRIP_TABLE)
         
         # Handle generic captures like QRxP
         if notation == 'P' or notation == '':
             return self._parse_qualified_capture(piece_char, side_qualifier)
         
         # Parse destination file and rank
-        file_desc = None
+        file_desc, ambiguous_file, notation = self._match_file(notation)
         rank_desc = None
-        ambiguous_file = None
-        
-        # Try to match file patterns (longest first)
-        for file_pattern in ['QR', 'QN', 'QB', 'KR', 'KN', 'KB', 'Q', 'K']:
-            if notation.startswith(file_pattern):
-                file_desc = file_pattern
-                notation = notation[len(file_pattern):]
-                break
-        
-        # If no standard file found, check for ambiguous abbreviated files
-        if file_desc is None:
-            for abbrev in ['R', 'N', 'B']:
-                if notation.startswith(abbrev):
-                    ambiguous_file = abbrev
-                    notation = notation[1:]
-                    break
         
         # Extract rank
-        rank_match = re.search(r'(\d+)', notation)
+        rank_match = _RANK_RE.search(notation)
         if rank_match:
             rank_desc = int(rank_match.group(1))
         
         if (file_desc is None and ambiguous_file is None) or rank_desc is None:
             return None
         
-        piece_map = {'P': 1, 'R': 4, 'N': 2, 'B': 3, 'Q': 5, 'K': 6}
-        piece_type = piece_map.get(piece_char)
+        piece_type = self._PIECE_TYPE_MAP.get(piece_char)
         if piece_type is None:
             return None
         
-        target_rank = self._descriptive_rank_to_standard(rank_desc)
-        if target_rank is None:
+        if not 1 <= rank_desc <= 8:
             return None
+        target_rank = self._ranks[rank_desc - 1]
         
         # Get all possible target squares
         target_squares = []
         if ambiguous_file:
             possible_files = self.AMBIGUOUS_FILES.get(ambiguous_file, [])
             for f in possible_files:
-                target_squares.append(self._file_rank_to_square(f, target_rank))
+                target_squares.append(target_rank * 8 + f)
         else:
-            target_file = self._descriptive_file_to_standard(file_desc)
-            if target_file:
-                target_squares.append(self._file_rank_to_square(target_file, target_rank))
+            target_file = self.FILE_MAP.get(file_desc)
+            if target_file is not None:
+                target_squares.append(target_rank * 8 + target_file)
         
         if not target_squares:
             return None
         
         # Find all candidate moves for this piece type to any target square
         candidates = []
-        for move in self.board.legal_moves:
-            if move.to_square in target_squares:
-                piece = self.board.piece_at(move.from_square)
-                if piece and piece.piece_type == piece_type and piece.color == self.board.turn:
-                    candidates.append(move)
+        for target_square in target_squares:
+            candidates.extend(self._piece_moves_to(piece_type, target_square))
+        if len(target_squares) > 1:
+            # Keep move generation order (latest origin square first, then
+            # latest target) so ties resolve the same way for either square
+            candidates.sort(key=lambda move: (-move.from_square, -move.to_square))
         
         if len(candidates) == 0:
             return None
@@ -364,11 +432,9 @@ class DescriptiveNotationParser:
         # Multiple candidates - use the side qualifier to disambiguate
         # Queenside pieces are on files a-d (indices 0-3)
         # Kingside pieces are on files e-h (indices 4-7)
+        want_queenside = side_qualifier == 'Q'
         for move in candidates:
-            from_file = move.from_square % 8  # 0-7 for a-h
-            if side_qualifier == 'Q' and from_file <= 3:  # Queenside (a-d)
-                return move
-            elif side_qualifier == 'K' and from_file >= 4:  # Kingside (e-h)
+            if want_queenside == ((move.from_square & 7) < 4):  # File 0-7 for a-h
                 return move
         
         # If no exact match, just return first candidate
@@ -376,19 +442,19 @@ class DescriptiveNotationParser:
     
     def _parse_qualified_capture(self, piece_char: str, side_qualifier: str) -> Optional[Move]:
         """Parse qualified captures like QRxP, KNxB where target isn't fully specified."""
-        piece_map = {'P': 1, 'R': 4, 'N': 2, 'B': 3, 'Q': 5, 'K': 6}
-        piece_type = piece_map.get(piece_char)
+        piece_type = self._PIECE_TYPE_MAP.get(piece_char)
         
         if piece_type is None:
             return None
         
+        self._index_legal_moves()
+        piece_type_at = self.board.piece_type_at
+        
         # Find all capture moves for this piece type
+        # (legal moves only ever move the side to move's pieces)
         candidates = []
-        for move in self.board.legal_moves:
-            piece = self.board.piece_at(move.from_square)
-            captured = self.board.piece_at(move.to_square)
-            if (piece and piece.piece_type == piece_type and 
-                piece.color == self.board.turn and captured):
+        for move in self._by_piece_type[piece_type]:
+            if piece_type_at(move.to_square):
                 candidates.append(move)
         
         if len(candidates) == 0:
@@ -397,11 +463,9 @@ class DescriptiveNotationParser:
             return candidates[0]
         
         # Multiple candidates - use side qualifier to disambiguate
+        want_queenside = side_qualifier == 'Q'
         for move in candidates:
-            from_file = move.from_square % 8
-            if side_qualifier == 'Q' and from_file <= 3:
-                return move
-            elif side_qualifier == 'K' and from_file >= 4:
+            if want_queenside == ((move.from_square & 7) < 4):
                 return move
         
         return candidates[0]
@@ -411,24 +475,22 @@ class DescriptiveNotationParser:
         Parse generic captures like NxP, NxB, RxR where target isn't a square.
         captured_type: optional piece type being captured (P, R, N, B, Q, K)
         """
-        piece_map = {'P': 1, 'R': 4, 'N': 2, 'B': 3, 'Q': 5, 'K': 6}
-        piece_type = piece_map.get(piece_char)
-        target_piece_type = piece_map.get(captured_type) if captured_type else None
+        piece_type = self._PIECE_TYPE_MAP.get(piece_char)
+        target_piece_type = self._PIECE_TYPE_MAP.get(captured_type) if captured_type else None
         
         if piece_type is None:
             return None
         
-        legal_moves = list(self.board.legal_moves)
+        self._index_legal_moves()
+        piece_type_at = self.board.piece_type_at
         
         # Find all capture moves for this piece type
         candidates = []
-        for move in legal_moves:
-            piece = self.board.piece_at(move.from_square)
-            captured = self.board.piece_at(move.to_square)
-            if (piece and piece.piece_type == piece_type and 
-                piece.color == self.board.turn and captured):
+        for move in self._by_piece_type[piece_type]:
+            captured_piece_type = piece_type_at(move.to_square)
+            if captured_piece_type:
                 # If target piece type specified, filter by it
-                if target_piece_type is None or captured.piece_type == target_piece_type:
+                if target_piece_type is None or captured_piece_type == target_piece_type:
                     candidates.append(move)
         
         if len(candidates) == 1:
@@ -450,84 +512,78 @@ class DescriptiveNotationParser:
         is_capture = 'x' in notation or 'X' in notation
         
         # Handle generic pawn captures: PxP, PxN, PxB, PxR, PxQ
-        remaining = notation.replace('x', '').replace('X', '')
-        if remaining in ['P', 'N', 'B', 'R', 'Q', '']:
-            captured_type = remaining if remaining else None
+        notation = notation.translate(_STRIP_CAPTURE_TABLE)
+        if notation in ['P', 'N', 'B', 'R', 'Q', '']:
+            captured_type = notation if notation else None
             return self._parse_generic_capture('P', captured_type)
         
-        notation = notation.replace('x', '').replace('X', '')
-        
         # Extract file and rank
-        file_desc = None
+        file_desc, ambiguous_file, notation = self._match_file(notation)
         rank_desc = None
-        ambiguous_file = None
-        
-        # Try to match file patterns (longest first)
-        for file_pattern in ['QR', 'QN', 'QB', 'KR', 'KN', 'KB', 'Q', 'K']:
-            if notation.startswith(file_pattern):
-                file_desc = file_pattern
-                notation = notation[len(file_pattern):]
-                break
-        
-        # If no standard file found, check for ambiguous abbreviated files (R, N, B)
-        if file_desc is None:
-            for abbrev in ['R', 'N', 'B']:
-                if notation.startswith(abbrev):
-                    ambiguous_file = abbrev
-                    notation = notation[1:]
-                    break
         
         # Extract rank
-        rank_match = re.search(r'(\d+)', notation)
+        rank_match = _RANK_RE.search(notation)
         if rank_match:
             rank_desc = int(rank_match.group(1))
         
         if (file_desc is None and ambiguous_file is None) or rank_desc is None:
             return None
         
-        target_rank = self._descriptive_rank_to_standard(rank_desc)
-        if target_rank is None:
+        if not 1 <= rank_desc <= 8:
             return None
+        target_rank = self._ranks[rank_desc - 1]
+        
+        self._index_legal_moves()
+        piece_type_at = self.board.piece_type_at
+        # With at most one legal move of this piece type there is nothing to
+        # search for or disambiguate
+        lone_moves = self._by_piece_type[1]
+        single = len(lone_moves) < 2
         
         # If we have an ambiguous file, try both possibilities
         if ambiguous_file:
             possible_files = self.AMBIGUOUS_FILES.get(ambiguous_file, [])
+            if single:
+                for move in lone_moves:
+                    if move.to_square // 8 == target_rank and move.to_square % 8 in possible_files:
+                        return move
+                return None
             all_candidates = []
             
             for target_file in possible_files:
-                target_square = self._file_rank_to_square(target_file, target_rank)
+                target_square = target_rank * 8 + target_file
                 
-                for move in self.board.legal_moves:
-                    if move.to_square == target_square:
-                        piece = self.board.piece_at(move.from_square)
-                        if piece and piece.piece_type == 1 and piece.color == self.board.turn:
-                            all_candidates.append(move)
+                for move in self._by_to.get(target_square, ()):
+                    if piece_type_at(move.from_square) == 1:
+                        all_candidates.append(move)
             
             if len(all_candidates) == 1:
                 return all_candidates[0]
             elif len(all_candidates) > 1:
                 if is_capture:
                     for move in all_candidates:
-                        if self.board.piece_at(move.to_square):
+                        if piece_type_at(move.to_square):
                             return move
                 return all_candidates[0]
             return None
         
         # Standard file handling
-        target_file = self._descriptive_file_to_standard(file_desc)
+        target_file = self.FILE_MAP.get(file_desc)
         if target_file is None:
             return None
         
-        target_square = self._file_rank_to_square(target_file, target_rank)
+        target_square = target_rank * 8 + target_file
+        if single:
+            for move in lone_moves:
+                if move.to_square == target_square:
+                    return move
+            return None
         
         # Find pawn moves to this square
-        legal_moves = list(self.board.legal_moves)
         candidates = []
-        for move in legal_moves:
-            if move.to_square == target_square:
-                piece = self.board.piece_at(move.from_square)
-                if piece and piece.piece_type == 1 and piece.color == self.board.turn:  # Pawn
-                    candidates.append(move)
+        for move in self._by_to.get(target_square, ()):
+            if piece_type_at(move.from_square) == 1:  # Pawn
+                candidates.append(move)
         
         if len(candidates) == 1:
             return candidates[0]
@@ -535,30 +591,39 @@ class DescriptiveNotationParser:
             # If multiple pawns can move, prefer capture if it's a capture
             if is_capture:
                 for move in candidates:
-                    if self.board.piece_at(move.to_square):
+                    if piece_type_at(move.to_square):
                         return move
             return candidates[0]
         
         return None
     
-    def _descriptive_file_to_standard(self, file_desc: str) -> Optional[str]:
-        """Convert descriptive file to standard file (a-h)."""
-        return self.FILE_MAP.get(file_desc)
-    
-    def _descriptive_rank_to_standard(self, rank_desc: int) -> Optional[int]:
+    def _match_file(self, notation: str) -> Tuple[Optional[str], Optional[str], str]:
         """
-        Convert descriptive rank to standard rank (0-7).
-        In descriptive notation, ranks are from each player's perspective.
+        Split a leading file name off notation.
+        Returns (file_desc, ambiguous_file, rest): file_desc is a full file name
+        (QR ... KR), ambiguous_file an abbreviated one (R, N or B), or both None.
         """
-        if self.is_white_turn:
-            # White's perspective: rank 1 is bottom (rank 0), rank 8 is top (rank 7)
-            return rank_desc - 1
-        else:
-            # Black's perspective: rank 1 is top (rank 7), rank 8 is bottom (rank 0)
-            return 8 - rank_desc
+        # Two-letter names first so QR is not read as Q
+        if notation[:2] in self.TWO_LETTER_FILES:
+            return notation[:2], None, notation[2:]
+        if notation[:1] in ('Q', 'K'):
+            return notation[:1], None, notation[1:]
+        if notation[:1] in self.AMBIGUOUS_FILES:
+            return None, notation[:1], notation[1:]
+        return None, None, notation
     
-    def _file_rank_to_square(self, file: str, rank: int) -> Square:
-        """Convert file (a-h) and rank (0-7) to Square."""
-        file_idx = ord(file) - ord('a')
-        return Square(rank * 8 + file_idx)
-
+    # Handler by notation prefix; parse() tries the first three, two and one
+    # characters in turn and falls back to a pawn move
+    _DISPATCH = {
+        # Qualified piece names must be followed by - or x to be piece moves
+        # (QR-K1, KNxP); QR4 is a pawn move to that file
+        **dict.fromkeys([name + separator
+                         for name in ('QR', 'KR', 'QN', 'KN', 'QB', 'KB')
+                         for separator in ('-', 'x', 'X')],
+                        _parse_qualified_piece_move),
+        **dict.fromkeys(['K-', 'Kx', 'KX'], _parse_piece_move),
+        # File names, not king moves
+        **dict.fromkeys(['KB', 'KN', 'KR'], _parse_pawn_move),
+        **dict.fromkeys(['R', 'N', 'B', 'Q'], _parse_piece_move),
+        'K': _parse_king_or_pawn_move,
+    }
@@ -0,0 +1,115 @@
+"""
+Tests for the chess board GUI. The move history is tested on its own, which
+needs no display; the GUI test is skipped when no display is available.
+
+"""
+
+import pytest
+
+tk = pytest.importorskip("tkinter")
+
+from chess import Board, Move, parse_square
+from chess_board_gui import ChessBoardGUI, MoveHistory, MoveToDescriptive
+
+
+def _play(ucis):
+    """(history, final board) after recording moves given in UCI from the start."""
+    board = Board()
+    history = MoveHistory(board.fen())
+    for uci in ucis:
+        move = Move.from_uci(uci)
+        history.append(move, MoveToDescriptive.convert(board, move))
+        board.push(move)
+    return history, board
+
+
+def test_history_positions():
+    """Test that each position is replayed from the recorded moves."""
+    history, board = _play(["e2e4", "e7e5", "g1f3"])
+    
+    assert len(history) == 3
+    assert history.notations == ["P-K4", "P-K4", "N-KB3"]
+    assert history.position(0).fen() == Board().fen()
+    assert history.position(3).fen() == board.fen()
+
+
+def test_history_edit_keeps_moves():
+    """Test that an edit at the last position keeps the moves leading to it."""
+    history, board = _play(["e2e4", "e7e5", "g1f3"])
+    before = history.position(2).fen()
+    
+    board.remove_piece_at(parse_square("a2"))
+    history.set_position(3, board.fen())
+    assert len(history) == 3
+    assert history.position(3).fen() == board.fen()
+    assert history.position(2).fen() == before
+
+
+def test_history_edit_before_later_moves():
+    """Test that an edit at an earlier position keeps the positions after it."""
+    history, board = _play(["e2e4", "e7e5", "g1f3"])
+    later = [history.position(index).fen() for index in (2, 3)]
+    
+    edited = history.position(1)
+    edited.turn = not edited.turn
+    history.set_position(1, edited.fen())
+    assert history.position(1).fen() == edited.fen()
+    assert [history.position(index).fen() for index in (2, 3)] == later
+    assert history.segment(3)[0] == 2
+    
+    # Moves played from the edited position replace the later ones
+    history.truncate(1)
+    move = Move.from_uci("d2d4")
+    history.append(move, MoveToDescriptive.convert(edited, move))
+    edited.push(move)
+    assert history.notations == ["P-K4", "P-Q4"]
+    assert history.segment(2)[0] == 1
+    assert history.position(2).fen() == edited.fen()
+
+
+def test_gui_edit_keeps_history():
+    """Test that setup edits start a new history segment instead of losing moves."""
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("no display")
+    root.withdraw()
+    
+    try:
+        app = ChessBoardGUI(root)
+        for uci in ("e2e4", "e7e5", "g1f3"):
+            app._make_move(Move.from_uci(uci), animate=False)
+        
+        # Dropping a piece where it can't move is a setup edit
+        app._set_piece(parse_square("a5"), 'P')
+        app._clear_piece(parse_square("a2"))
+        assert app.current_move_index == 3 and len(app._history) == 3
+        app._navigate_to_move(2, animate=False)
+        assert app.board.piece_at(parse_square("f3")) is None
+        app._navigate_to_move(3, animate=False)
+        assert app.board.piece_at(parse_square("a5")) is not None
+        
+        # Switching turn at an earlier move keeps the moves after it
+        app._navigate_to_move(1, animate=False)
+        app._switch_turn()
+        assert app.board.turn and len(app._history) == 3
+        app._navigate_to_move(2, animate=False)
+        assert app.board.piece_at(parse_square("e5")) is not None
+        app._navigate_to_move(3, animate=False)
+        assert app.board.piece_at(parse_square("a2")) is None
+        
+        # A move from the edited position replaces the later moves
+        app._navigate_to_move(1, animate=False)
+        app._make_move(Move.from_uci("d2d4"), animate=False)
+        assert app._history.notations == ["P-K4", "P-Q4"]
+        app._navigate_to_move(0, animate=False)
+        app._navigate_to_move(2, animate=False)
+        assert app.board.piece_at(parse_square("d4")) is not None
+        app._undo_move()
+        assert app.current_move_index == 1 and app.board.turn
+    finally:
+        root.destroy()
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
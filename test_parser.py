@@ -6,60 +6,136 @@ Aaron Beckley December 17, 2025
 
 """
 
-from chess import Board
+import pytest
+
+from chess import Board, Move, parse_square
 from descriptive_notation_parser import DescriptiveNotationParser
 
 
-def test_basic_moves():
+# Starting positions, parsed once and copied by each test
+_START_BOARD = Board()
+# A position where castling is possible
+_CASTLING_BOARD = Board("r1bqk2r/pppp1ppp/2n2n2/2b1p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4")
+
+
+def _squares(uci):
+    """(from_square, to_square) of a move given in UCI."""
+    return parse_square(uci[:2]), parse_square(uci[2:4])
+
+
+# Each case gives the moves (in UCI) leading to the position, so the cases
+# don't depend on each other
+BASIC_MOVES = [
+    ([], "P-K4", "e2e4"),  # White pawn to e4
+    (["e2e4"], "P-K4", "e7e5"),  # Black pawn to e5 (after white moves)
+    (["e2e4", "e7e5"], "N-KB3", "g1f3"),  # White knight to f3
+    (["e2e4", "e7e5"], "P-Q4", "d2d4"),  # White pawn to d4
+]
+
+
+@pytest.mark.parametrize("setup_moves,notation,expected_uci", BASIC_MOVES)
+def test_basic_moves(setup_moves, notation, expected_uci):
     """Test basic descriptive notation moves."""
-    board = Board()
+    board = _START_BOARD.copy(stack=False)
+    for uci in setup_moves:
+        board.push_uci(uci)
     parser = DescriptiveNotationParser(board)
     
-    # Test some common opening moves
-    test_cases = [
-        ("P-K4", "e2e4"),  # White pawn to e4
-        ("P-K4", "e7e5"),  # Black pawn to e5 (after white moves)
-        ("N-KB3", "g1f3"),  # White knight to f3
-        ("P-Q4", "d2d4"),  # White pawn to d4
-    ]
+    move = parser.parse(notation)
+    assert move is not None, f"{notation} failed to parse"
+    assert (move.from_square, move.to_square) == _squares(expected_uci), move.uci()
+
+
+# (FEN, notation, expected move in UCI or None) for piece moves whose origin
+# is found from the attack bitboards, plus promotions
+PIECE_MOVES = [
+    # The e2 knight also attacks c3 but is pinned to the king
+    ("4r2k/8/8/8/8/8/4N3/1N2K3 w - - 0 1", "N-QB3", "b1c3"),
+    ("4r2k/8/8/8/8/8/4N3/4K3 w - - 0 1", "N-QB3", None),
+    # A king move to KN1 is castling, which no attack mask covers
+    ("r1bqk2r/pppp1ppp/2n2n2/2b1p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4", "K-KN1", "e1g1"),
+    # Both rooks reach c1 and f1; candidates are taken latest origin first,
+    # then latest target, before the side qualifier picks one
+    ("4k3/8/8/8/8/8/4K3/R6R w - - 0 1", "QR-B1", "a1f1"),
+    ("4k3/8/8/8/8/8/4K3/R6R w - - 0 1", "KR-B1", "h1f1"),
+    # B3 could be QB3 or KB3 and a knight reaches each; the QB file comes first
+    ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", "N-B3", "b1c3"),
+    ("k7/4P3/8/8/8/8/8/4K3 w - - 0 1", "P-K8(Q)", "e7e8q"),
+    ("k7/4P3/8/8/8/8/8/4K3 w - - 0 1", "P-K8(N)", "e7e8n"),
+    ("4k3/8/8/8/8/8/4p3/K7 b - - 0 1", "P-K8(Q)", "e2e1q"),  # Black's K8 is e1
+]
+
+
+@pytest.mark.parametrize("fen,notation,expected_uci", PIECE_MOVES)
+def test_piece_moves(fen, notation, expected_uci):
+    """Test piece move disambiguation, castling by king move and promotions."""
+    parser = DescriptiveNotationParser(Board(fen))
     
-    print("Testing basic moves...")
-    for notation, expected_uci in test_cases:
-        move = parser.parse(notation)
-        if move:
-            actual_uci = move.uci()
-            status = "✓" if actual_uci == expected_uci else "✗"
-            print(f"{status} {notation:10} -> {actual_uci} (expected: {expected_uci})")
-        else:
-            print(f"✗ {notation:10} -> Failed to parse")
-        
-        # Make the move to test next one from black's perspective
-        if move and move in board.legal_moves:
-            board.push(move)
-            parser = DescriptiveNotationParser(board)
+    move = parser.parse(notation)
+    expected = Move.from_uci(expected_uci) if expected_uci else None
+    assert move == expected, move.uci() if move else None
 
 
 def test_castling():
     """Test castling moves."""
-    # Create a position where castling is possible
-    board = Board("r1bqk2r/pppp1ppp/2n2n2/2b1p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4")
+    board = _CASTLING_BOARD.copy(stack=False)
     parser = DescriptiveNotationParser(board)
     
-    print("\nTesting castling...")
     move = parser.parse("O-O")
-    if move:
-        print(f"✓ O-O -> {move.uci()}")
-    else:
-        print("✗ O-O -> Failed to parse")
+    assert move is not None, "O-O failed to parse"
+    assert (move.from_square, move.to_square) == _squares("e1g1"), move.uci()
+    
+    # Moves can be modified; that must not leak into other parsers' results
+    move.to_square = parse_square("h1")
+    other = DescriptiveNotationParser(board.copy(stack=False)).parse("O-O")
+    assert (other.from_square, other.to_square) == _squares("e1g1"), other.uci()
 
 
-if __name__ == "__main__":
-    try:
-        test_basic_moves()
-        test_castling()
-        print("\nTests completed!")
-    except ImportError:
-        print("Error: python-chess not installed. Run: pip install -r requirements.txt")
-    except Exception as e:
-        print(f"Error during testing: {e}")
+def test_parser_reuse():
+    """Test that one parser follows the side to move as moves are pushed."""
+    board = _START_BOARD.copy(stack=False)
+    parser = DescriptiveNotationParser(board)
+    
+    for notation, expected_uci in [("P-K4", "e2e4"), ("P-K4", "e7e5")]:
+        move = parser.parse(notation)
+        assert move is not None, f"{notation} failed to parse"
+        assert (move.from_square, move.to_square) == _squares(expected_uci), move.uci()
+        assert board.is_legal(move)
+        board.push(move)
+
+
+def test_parse_many():
+    """Test parsing several notations against one position."""
+    board = _START_BOARD.copy(stack=False)
+    parser = DescriptiveNotationParser(board)
+    
+    test_cases = [
+        ("P-K4", "e2e4"),
+        ("N-KB3", "g1f3"),
+        ("P-QB4", "c2c4"),
+        ("N-Q4", None),  # No knight reaches d4
+    ]
+    moves = parser.parse_many([notation for notation, _ in test_cases])
+    for (notation, expected_uci), move in zip(test_cases, moves):
+        actual_uci = move.uci() if move else None
+        assert actual_uci == expected_uci, notation
+
+
+def test_parse_cache_returns_fresh_moves():
+    """Test that modifying a parsed move doesn't change later parses of it."""
+    board = _START_BOARD.copy(stack=False)
+    parser = DescriptiveNotationParser(board)
+    
+    move = parser.parse("P-K4")
+    move.to_square = parse_square("e3")
+    again = parser.parse("P-K4")
+    assert again is not move
+    assert (again.from_square, again.to_square) == _squares("e2e4"), again.uci()
+    
+    batch_move, = parser.parse_many(["P-K4"])
+    assert batch_move is not again
+    assert (batch_move.from_square, batch_move.to_square) == _squares("e2e4"), batch_move.uci()
 
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))